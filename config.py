@@ -0,0 +1,38 @@
+import os
+import logging
+from dotenv import load_dotenv
+
+# Load environment variables once for the whole pipeline
+load_dotenv()
+
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+GOOGLE_CREDENTIALS_PATH = os.getenv('GOOGLE_CREDENTIALS_PATH')
+SPREADSHEET_NAME = os.getenv('SPREADSHEET_NAME', 'GroundNewsArticles')
+
+# Root log level; set to WARNING in production to skip per-article INFO records
+LOG_LEVEL = (os.getenv('LOG_LEVEL') or 'INFO').upper()
+# basicConfig raises on unknown names, which would stop the pipeline at import;
+# getLevelName returns an int only for registered level names
+if not isinstance(logging.getLevelName(LOG_LEVEL), int):
+    logging.getLogger(__name__).warning(f"Unknown LOG_LEVEL '{LOG_LEVEL}', using INFO.")
+    LOG_LEVEL = 'INFO'
+
+# OpenAI throughput limits; tune to the account's rate-limit tier
+OPENAI_MAX_RPM = int(os.getenv('OPENAI_MAX_RPM', '500'))
+OPENAI_MAX_CONCURRENT_REQUESTS = int(os.getenv('OPENAI_MAX_CONCURRENT_REQUESTS', '20'))
+
+# Runs with at least this many articles use the OpenAI Batch API (half price, separate
+# rate limits). Batch jobs can take up to 24h, so the default keeps the daily run on live
+# requests; unfinished jobs are cancelled after OPENAI_BATCH_TIMEOUT seconds and retried live.
+OPENAI_BATCH_MIN_ARTICLES = int(os.getenv('OPENAI_BATCH_MIN_ARTICLES', '200'))
+OPENAI_BATCH_TIMEOUT = int(os.getenv('OPENAI_BATCH_TIMEOUT', '3600'))
+
+# Optional Redis-backed semantic cache for summaries (needs redisvl); off when REDIS_URL is unset.
+# Lower distances require closer paraphrases before a cached summary is reused. Headlines about
+# the same story with a different outcome ("votes for" vs "votes against") can still fall inside
+# the threshold and be served the other's summary, so keep it tight; hits whose figures differ
+# are always rejected, and entries expire after SEMANTIC_CACHE_TTL seconds so a wrong or stale
+# summary can't outlive the news cycle.
+REDIS_URL = os.getenv('REDIS_URL')
+SEMANTIC_CACHE_DISTANCE = float(os.getenv('SEMANTIC_CACHE_DISTANCE', '0.05'))
+SEMANTIC_CACHE_TTL = int(os.getenv('SEMANTIC_CACHE_TTL', str(3 * 24 * 3600)))
\ No newline at end of file
@@ -1,23 +1,57 @@
-from googleapiclient.discovery import build
-from google.oauth2.service_account import Credentials
+import re
 from geotext import GeoText
+import numpy as np
 import pandas as pd
 from openai import OpenAI
-from dotenv import load_dotenv
 import os
 import logging
 from datetime import datetime
 from googleapiclient.errors import HttpError
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from config import OPENAI_API_KEY, GOOGLE_CREDENTIALS_PATH, LOG_LEVEL
+from google_clients import get_sheets_service
 
 # Set up logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
+# GeoText's candidate pattern (capitalised words, optionally joined by a space or hyphen),
+# compiled once instead of on every GeoText(text) call
+CITY_CANDIDATE_PATTERN = re.compile(r"[A-ZÀ-Ú]+[a-zà-ú]+[ \-]?(?:d[a-u].)?(?:[A-ZÀ-Ú]+[a-zà-ú]+)*")
+# City lexicon as a set built once at import; country names are not considered cities
+CITY_NAMES = frozenset(city for city in GeoText.index.cities if city not in GeoText.index.countries)
+
+def extract_cities(text):
+    """Return city names mentioned in text, matching GeoText(text).cities."""
+    # Like GeoText, a candidate span only counts when the whole span is a city name
+    candidates = (candidate.strip() for candidate in CITY_CANDIDATE_PATTERN.findall(text))
+    return [candidate for candidate in candidates if candidate.lower() in CITY_NAMES]
+
+# Article dictionary keys mapped to the Google Sheet column names used below
+SHEET_COLUMNS = {
+    'headline': 'Headline',
+    'source': 'Source',
+    'url': 'URL',
+    'category': 'Category',
+    'summary': 'Summary',
+    'timestamp': 'Timestamp'
+}
+
+def most_common(values, n):
+    """
+    Return the n most frequent values, most frequent first, counted in numpy.
+    
+    Ties keep first-seen order, matching pandas value_counts.
+    """
+    names, first_index, counts = np.unique(np.array(values, dtype=str), return_index=True, return_counts=True)
+    # lexsort orders by its last key first: count descending, then first occurrence
+    top = np.lexsort((first_index, -counts))[:n]
+    return names[top].tolist()
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -31,44 +65,68 @@ def fetch_sheets_data(service, spreadsheet_id, range_name):
         range=range_name
     ).execute()
 
-def generate_explainer_script():
+def load_sheet_articles():
+    """
+    Read stored articles back from Google Sheets.
+    
+    Returns:
+        pd.DataFrame: Articles with the sheet's columns or None if none were found.
+    """
+    # Initialize Google Sheets client
+    credentials_path = GOOGLE_CREDENTIALS_PATH or 'credentials.json'
+    if not os.path.exists(credentials_path):
+        logger.error(f"{credentials_path} not found in {os.getcwd()}")
+        raise FileNotFoundError(f"{credentials_path} not found")
+    service = get_sheets_service(credentials_path)
+    spreadsheet_id = '1CmeiZuIMbgVss2x4R1zGIvYjTenI6E3Jpn_F96iTJKA'
+
+    # Fetch data with retry
+    try:
+        result = fetch_sheets_data(service, spreadsheet_id, 'Articles!A1:F1000')
+    except Exception as e:
+        logger.error(f"Failed to fetch data from Google Sheets after retries: {e}")
+        return None
+    data = result.get('values', [])
+    if not data or len(data) <= 1:
+        logger.error("No articles found in Google Sheet.")
+        return None
+    
+    # Create DataFrame
+    df = pd.DataFrame(data[1:], columns=data[0])
+    logger.info(f"Loaded {len(df)} articles from Google Sheet.")
+    return df
+
+def generate_explainer_script(articles=None):
+    """
+    Generate a 60-second explainer video script from article insights.
+    
+    Args:
+        articles: Optional list of article dictionaries (as produced by the summarizer)
+            or a DataFrame. When omitted, articles are read back from Google Sheets.
+    
+    Returns:
+        bool: True if the script was generated and saved, False otherwise.
+    """
     logger.info("Generating explainer script...")
     try:
-        # Load environment variables
-        load_dotenv()
-        openai_api_key = os.getenv('OPENAI_API_KEY')
+        openai_api_key = OPENAI_API_KEY
         if not openai_api_key:
             logger.error("OPENAI_API_KEY not found")
             raise ValueError("Missing OPENAI_API_KEY")
 
-        # Initialize Google Sheets client
-        credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials.json')
-        if not os.path.exists(credentials_path):
-            logger.error(f"{credentials_path} not found in {os.getcwd()}")
-            raise FileNotFoundError(f"{credentials_path} not found")
-        creds = Credentials.from_service_account_file(credentials_path)
-        service = build('sheets', 'v4', credentials=creds, cache_discovery=False)  # Disable file_cache
-        spreadsheet_id = '1CmeiZuIMbgVss2x4R1zGIvYjTenI6E3Jpn_F96iTJKA'
-
-        # Fetch data with retry
-        try:
-            result = fetch_sheets_data(service, spreadsheet_id, 'Articles!A1:F1000')
-        except Exception as e:
-            logger.error(f"Failed to fetch data from Google Sheets after retries: {e}")
-            return False
-        data = result.get('values', [])
-        if not data or len(data) <= 1:
-            logger.error("No articles found in Google Sheet.")
-            return False
-        
-        # Create DataFrame
-        df = pd.DataFrame(data[1:], columns=data[0])
-        logger.info(f"Loaded {len(df)} articles from Google Sheet.")
+        if articles is None:
+            df = load_sheet_articles()
+            if df is None:
+                return False
+        else:
+            # Use the in-memory articles directly instead of a second Sheets round-trip
+            df = pd.DataFrame(articles).rename(columns=SHEET_COLUMNS)
+            logger.info(f"Using {len(df)} in-memory articles.")
         logger.info(f"DataFrame columns: {df.columns.tolist()}")  # Debug column names
 
         # Handle empty DataFrame
         if df.empty:
-            logger.error("DataFrame is empty. No articles found in Google Sheet.")
+            logger.error("DataFrame is empty. No articles to summarize.")
             return False
 
         # Handle empty summaries
@@ -79,15 +137,8 @@ def generate_explainer_script():
             logger.error(f"Expected 'Timestamp' column, but found: {df.columns.tolist()}")
             return False
 
-        # Clean and convert Timestamp column
-        def parse_date(date_str):
-            try:
-                return pd.to_datetime(date_str, format='mixed', errors='coerce')
-            except Exception as e:
-                logger.debug(f"Invalid date format for '{date_str}': {e}")
-                return pd.NaT
-
-        df['Date'] = df['Timestamp'].apply(parse_date)
+        # Clean and convert Timestamp column in one vectorized pass (invalid values become NaT)
+        df['Date'] = pd.to_datetime(df['Timestamp'], format='mixed', errors='coerce')
         if df['Date'].isna().all():
             logger.error("All dates are invalid or missing in the 'Timestamp' column.")
             return False
@@ -96,20 +147,21 @@ def generate_explainer_script():
 
         # Compute insights
         category_counts = df['Category'].value_counts().head(2)
-        locations = df['Summary'].apply(lambda x: GeoText(x).cities if isinstance(x, str) else []).explode().value_counts().head(3)
+        city_mentions = [city for cities in df['Summary'].fillna('').map(extract_cities) for city in cities]
+        locations = most_common(city_mentions, 3)
         latest_date = df['Date'].max().strftime('%B %d, %Y %I:%M %p WAT')
         sample_headline = df['Headline'].iloc[0] if not df['Headline'].empty else 'No headline available.'
 
         # Initialize OpenAI client
         client = OpenAI(api_key=openai_api_key)
-        locations_str = ', '.join(locations.index) if not locations.empty else 'None'
+        locations_str = ', '.join(locations) if locations else 'None'
         article_count = len(df)
 
         # Generate script
         prompt = f"""
         You are a professional scriptwriter creating a 60-second explainer video script (120-150 words) summarizing news articles. Use the following insights from {article_count} articles scraped from Ground.news:
 
-        - Top categories: {category_counts.index[0] if len(category_counts) > 0 else 'None'} ({category_counts[0] if len(category_counts) > 0 else 0} articles), {category_counts.index[1] if len(category_counts) > 1 else 'None'} ({category_counts[1] if len(category_counts) > 1 else 0} articles).
+        - Top categories: {category_counts.index[0] if len(category_counts) > 0 else 'None'} ({category_counts.iloc[0] if len(category_counts) > 0 else 0} articles), {category_counts.index[1] if len(category_counts) > 1 else 'None'} ({category_counts.iloc[1] if len(category_counts) > 1 else 0} articles).
         - Latest article date: {latest_date}.
         - Locations mentioned (if any): {locations_str}.
         - Sample headline: {sample_headline}.
@@ -0,0 +1,73 @@
+import logging
+import gspread
+from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+from config import LOG_LEVEL
+
+# Set up logging
+logging.basicConfig(
+    level=LOG_LEVEL,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+# Lazily initialized Google objects keyed by credentials path, shared across the pipeline
+_credentials = {}
+_gspread_clients = {}
+_sheets_services = {}
+
+def get_credentials(credentials_path):
+    """
+    Load service account credentials, parsing the key file only once.
+    
+    Args:
+        credentials_path: Path to Google service account JSON key file.
+    
+    Returns:
+        google.oauth2.service_account.Credentials: Scoped credentials.
+    """
+    if credentials_path not in _credentials:
+        _credentials[credentials_path] = Credentials.from_service_account_file(credentials_path, scopes=SCOPES)
+    return _credentials[credentials_path]
+
+def get_gspread_client(credentials_path):
+    """
+    Return a shared gspread client, authorizing it on first use.
+    
+    Args:
+        credentials_path: Path to Google service account JSON key file.
+    
+    Returns:
+        gspread.Client: Authorized client.
+    """
+    if credentials_path not in _gspread_clients:
+        logger.info("Initializing gspread client...")
+        _gspread_clients[credentials_path] = gspread.authorize(get_credentials(credentials_path))
+    return _gspread_clients[credentials_path]
+
+def get_sheets_service(credentials_path):
+    """
+    Return a shared Sheets API v4 service, building it on first use.
+    
+    Args:
+        credentials_path: Path to Google service account JSON key file.
+    
+    Returns:
+        googleapiclient.discovery.Resource: Sheets API service.
+    """
+    if credentials_path not in _sheets_services:
+        logger.info("Initializing Google Sheets API service...")
+        # Use the discovery document bundled with the library instead of fetching it
+        _sheets_services[credentials_path] = build(
+            'sheets', 'v4',
+            credentials=get_credentials(credentials_path),
+            cache_discovery=False,  # Disable file_cache
+            static_discovery=True
+        )
+    return _sheets_services[credentials_path]
\ No newline at end of file
@@ -1,13 +1,15 @@
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from scraper import scrape_ground_news, load_keywords
 from summarizer import summarize_articles
 from sheets import store_articles
 from explainer import generate_explainer_script
+from config import GOOGLE_CREDENTIALS_PATH, SPREADSHEET_NAME, LOG_LEVEL
 
 # Set up logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler()]
 )
@@ -38,38 +40,41 @@ def main():
             return
         logger.info(f"Summarized {len(summarized_articles)} articles.")
 
-        # Store in Google Sheets
-        logger.info("Storing articles in Google Sheets...")
-        credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH')
-        spreadsheet_name = os.getenv('SPREADSHEET_NAME', 'GroundNewsArticles')
+        # Store in Google Sheets and generate the explainer script side by side;
+        # both work from the summarized articles, so neither waits on the other
+        logger.info("Storing articles in Google Sheets and generating explainer script...")
+        credentials_path = GOOGLE_CREDENTIALS_PATH
+        spreadsheet_name = SPREADSHEET_NAME
         if not credentials_path or not os.path.exists(credentials_path):
             logger.error("Google credentials path not set or file not found.")
             return
-        success = store_articles(summarized_articles, credentials_path, spreadsheet_name)
-        if not success:
-            logger.error("Failed to store articles in Google Sheets.")
-            return
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            store_future = executor.submit(store_articles, summarized_articles, credentials_path, spreadsheet_name)
+            explainer_future = executor.submit(generate_explainer_script, summarized_articles)
+            stored = store_future.result()
+            explained = explainer_future.result()
 
-        # Generate explainer script
-        logger.info("Generating explainer script...")
-        success = generate_explainer_script()
-        if success:
+        if explained:
             logger.info("Explainer script generated and saved as explainer_script.txt")
         else:
             logger.error("Failed to generate explainer script.")
+        if not stored:
+            logger.error("Failed to store articles in Google Sheets.")
+            return
 
-        # Print results
+        # Print results as one block so the whole report is a single write
         logger.info(f"Processed {len(summarized_articles)} articles:")
-        for item in summarized_articles:
-            logger.info(f"Article keys: {item.keys()}")  # Debug keys
-            date = item.get('Timestamp', 'Unknown')  # Use Timestamp with fallback
-            print(f"Timestamp: {date}")
-            print(f"Category: {item['category']}")
-            print(f"Headline: {item['headline']}")
-            print(f"Source: {item['source']}")
-            print(f"URL: {item['url']}")
-            print(f"Summary: {item['summary']}")
-            print("-" * 100)
+        separator = "-" * 100
+        print('\n'.join(
+            f"Timestamp: {item.get('timestamp', 'Unknown')}\n"
+            f"Category: {item['category']}\n"
+            f"Headline: {item['headline']}\n"
+            f"Source: {item['source']}\n"
+            f"URL: {item['url']}\n"
+            f"Summary: {item['summary']}\n"
+            f"{separator}"
+            for item in summarized_articles
+        ))
 
     except Exception as e:
         logger.error(f"Pipeline failed: {e}", exc_info=True)
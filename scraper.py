@@ -1,24 +1,100 @@
 import os
-import time
+import re
 import logging
+from functools import lru_cache
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+import httpx
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
 from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
+from config import LOG_LEVEL
 
 # Set up logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://ground.news"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+
+# One pooled client for the whole process, so repeat requests to the same host reuse
+# kept-alive connections instead of repeating the TCP and TLS handshakes. The client builds
+# its own transports so the pool limits apply and HTTP(S)_PROXY/NO_PROXY are still honoured.
+HTTP_CLIENT = httpx.Client(
+    headers={'User-Agent': USER_AGENT},
+    timeout=20,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+)
+# Responses worth retrying, alongside failed connections
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Upper bound on scroll attempts when rendering with Selenium
+MAX_SCROLLS = 10
+
+# ChromeDriver path, resolved once per process by get_driver_path()
+_DRIVER_PATH = None
+
+# Keywords folded into a shared category
+CONFLICT_CATEGORY = 'Israel-Hamas Conflict'
+CONFLICT_KEYWORDS = frozenset({'israel', 'hamas', 'war', 'israeli'})
+
+def has_class(*classes):
+    """Build an XPath predicate matching elements that carry all the given classes."""
+    return ' and '.join(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in classes)
+
+# Compile selectors once; lxml evaluates them in C
+ARTICLE_CSS = 'div.flex.justify-between a.relative, div.group a.flex'
+ARTICLE_SELECTOR = CSSSelector(ARTICLE_CSS)
+# Each per-article query returns the text of its first match (or '') in a single evaluation
+HEADLINE_XPATH = etree.XPath(
+    f"string((.//h2[not({has_class('hidden')})] | .//h4 | .//*[{has_class('headline')}])[1])"
+)
+COVERAGE_SOURCE_XPATH = etree.XPath(
+    f"string((.//div[{has_class('text-12', 'leading-6')}]/span | .//span[{has_class('text-12', 'leading-6')}]"
+    f" | .//*[{has_class('source-info')}])[1])"
+)
+CATEGORY_SOURCE_XPATH = etree.XPath(
+    f"string((.//span[{has_class('text-12', 'leading-6')}] | .//div[{has_class('text-12', 'leading-6')}]/span)[1])"
+)
+TIMESTAMP_XPATH = etree.XPath(
+    f"string((.//time[@datetime] | .//*[{has_class('published-date')}] | .//span[{has_class('date')}])[1]/@datetime)"
+)
+
+@lru_cache(maxsize=None)
+def compile_keywords(keywords):
+    """
+    Compile keyword matching once per keyword list.
+    
+    Args:
+        keywords: Tuple of keywords.
+    
+    Returns:
+        Tuple of a case-insensitive alternation pattern and a dict mapping each
+        lowercased keyword to its (position, original spelling).
+    """
+    keyword_rank = {}
+    for kw in keywords:
+        keyword_rank.setdefault(kw.lower(), (len(keyword_rank), kw))
+    # Longest keywords first so "Israeli" is preferred over "Israel"
+    keyword_pattern = re.compile(
+        r'\b(' + '|'.join(re.escape(kw) for kw in sorted(keyword_rank, key=len, reverse=True)) + r')\b',
+        re.IGNORECASE
+    )
+    return keyword_pattern, keyword_rank
+
 def load_keywords(file_path='config/keywords.txt'):
     """Load keywords from a file."""
     try:
@@ -28,157 +104,230 @@ def load_keywords(file_path='config/keywords.txt'):
             with open(file_path, 'w') as f:
                 f.write("Iran\nIsrael\nHamas\nwar\nclimate\nUK\nUS\nIsraeli")
         with open(file_path, 'r') as f:
-            keywords = [line.strip() for line in f if line.strip()]
+            # Strip each line once and keep the non-empty results
+            keywords = [kw for kw in (line.strip() for line in f) if kw]
             logger.info(f"Loaded keywords: {keywords}")
             return keywords
     except Exception as e:
         logger.error(f"Error loading keywords: {e}")
         return ["Iran", "Israel", "Hamas", "war", "climate", "UK", "US", "Israeli"]
 
-def scrape_ground_news(keywords, max_articles=50, source_type='coverage'):
+def is_retryable_error(exception):
+    """Return True for failed connections and HTTP errors whose status code is worth retrying."""
+    if isinstance(exception, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    return isinstance(exception, httpx.HTTPStatusError) and exception.response.status_code in RETRY_STATUS_CODES
+
+@retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential_jitter(initial=0.3, max=5),
+    retry=retry_if_exception(is_retryable_error),
+    before_sleep=lambda retry_state: logger.info(f"Retrying HTTP request (attempt {retry_state.attempt_number})..."),
+    reraise=True
+)
+def http_get(url):
+    """GET a URL on the shared client, raising for error statuses."""
+    response = HTTP_CLIENT.get(url)
+    response.raise_for_status()
+    return response
+
+def fetch_landing_page(url):
     """
-    Scrape headlines from Ground.news landing page, filtering by keywords.
+    Fetch the server-rendered landing page over plain HTTP, without a browser.
     
     Args:
-        keywords: List of keywords to filter headlines.
-        max_articles: Maximum number of article containers to process.
-        source_type: 'coverage' for bias coverage, 'category' for category.
+        url: Page URL.
     
     Returns:
-        List of dictionaries with headline, source, URL, category, and timestamp.
+        tuple: Raw page bytes and their encoding, or (None, None) if the
+        request failed.
     """
-    base_url = "https://ground.news"
-    news_data = []
-    seen_urls = set()
-    seen_headlines = set()
+    try:
+        logger.info("Fetching Ground.news landing page over HTTP...")
+        response = http_get(url)
+        # Hand lxml the raw bytes; it decodes them in C instead of building a str copy first.
+        # Like response.text, fall back to UTF-8 when the headers declare no charset.
+        return response.content, response.charset_encoding or 'utf-8'
+    except httpx.HTTPError as e:
+        logger.warning(f"Error fetching landing page over HTTP: {e}")
+        return None, None
 
+def get_driver_path():
+    """Return the ChromeDriver path, installing or checking for it only on first use."""
+    global _DRIVER_PATH
+    if _DRIVER_PATH is None:
+        _DRIVER_PATH = ChromeDriverManager().install()
+    return _DRIVER_PATH
+
+def render_landing_page(url, max_articles=50):
+    """
+    Render the landing page in headless Chrome, scrolling to load more articles.
+    
+    Args:
+        url: Page URL.
+        max_articles: Stop scrolling once this many article containers are loaded.
+    
+    Returns:
+        str: Rendered page HTML or None if rendering failed.
+    """
     # Set up headless Chrome
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36")
+    options.add_argument(f"user-agent={USER_AGENT}")
     
     # Initialize WebDriver
     try:
-        service = Service(ChromeDriverManager().install())
+        service = Service(get_driver_path())
         driver = webdriver.Chrome(service=service, options=options)
     except Exception as e:
         logger.error(f"Error initializing WebDriver: {e}")
-        return news_data
+        return None
 
     try:
-        logger.info("Scraping articles from Ground.news landing page...")
-        driver.get(base_url)
+        logger.info("Rendering Ground.news landing page in headless Chrome...")
+        driver.get(url)
         # Wait for articles to load
         WebDriverWait(driver, 20).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.flex.justify-between a.relative, div.group a.flex"))
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ARTICLE_CSS))
         )
-        # Scroll multiple times
-        for i in range(5):
-            logger.debug(f"Scrolling page, attempt {i+1}")
+        # Scroll until no new articles load or enough are present, instead of fixed sleeps
+        loaded = len(driver.find_elements(By.CSS_SELECTOR, ARTICLE_CSS))
+        for i in range(MAX_SCROLLS):
+            if loaded >= max_articles:
+                break
+            logger.debug("Scrolling page, attempt %d (%d articles loaded)", i + 1, loaded)
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(4)
-
-        # Parse rendered HTML
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        articles = soup.select('div.flex.justify-between a.relative, div.group a.flex')
-        logger.info(f"Found {len(articles)} article containers")
-
-        if not articles:
-            logger.warning("No articles found on landing page. Check selectors or site structure.")
-
-        for index, article in enumerate(articles[:max_articles]):
             try:
-                logger.debug(f"Processing article {index+1}")
-                # Extract headline
-                headline_elem = article.select_one('h2:not(.hidden), h4, .headline')
-                headline = headline_elem.text.strip() if headline_elem else None
-                if not headline:
-                    logger.debug("Skipping article with no valid headline")
-                    continue
-                logger.debug(f"Headline found: {headline[:50]}...")
-
-                # Skip duplicate headlines
-                if headline in seen_headlines:
-                    logger.debug(f"Skipping duplicate headline: {headline[:50]}...")
-                    continue
-                seen_headlines.add(headline)
-
-                # Extract URL
-                url = article['href'] if article.get('href') else None
-                if url and url.startswith('/'):
-                    url = base_url + url
-                elif url and not url.startswith('http'):
-                    logger.debug(f"Invalid URL found: {url}")
-                    url = None
-                if not url:
-                    logger.debug(f"Skipping article with no valid URL: {headline[:50]}...")
-                    continue
-                logger.debug(f"URL found: {url}")
-
-                # Skip duplicate URLs
-                if url in seen_urls:
-                    logger.debug(f"Skipping duplicate article: {headline[:50]}...")
-                    continue
-                seen_urls.add(url)
-
-                # Check for keywords
-                matching_keyword = None
-                headline_lower = headline.lower()
-                for kw in keywords:
-                    if kw.lower() in headline_lower:
-                        if kw.lower() in ["israel", "hamas", "war", "israeli"]:
-                            matching_keyword = "Israel-Hamas Conflict"
-                            break
-                        elif not matching_keyword:
-                            matching_keyword = kw
-                if not matching_keyword:
-                    logger.debug(f"Skipping article with no matching keyword: {headline[:50]}...")
-                    continue
-                logger.debug(f"Matching keyword: {matching_keyword}")
-
-                # Extract source
-                source = 'Unknown'
-                if source_type == 'coverage':
-                    source_elem = article.select_one('div.text-12.leading-6 > span, span.text-12.leading-6, .source-info')
-                    source = source_elem.text.strip() if source_elem else 'Unknown'
-                else:
-                    source_elem = article.select_one('span.text-12.leading-6, div.text-12.leading-6 > span')
-                    source = source_elem.text.strip() if source_elem else 'Unknown'
-                logger.debug(f"Source found: {source}")
-
-                # Extract publication timestamp
-                time_elem = article.select_one('time[datetime], .published-date, span.date')
-                if time_elem and time_elem.get('datetime'):
-                    try:
-                        date_str = time_elem.get('datetime')
-                        timestamp = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%SZ').strftime('%Y-%m-%d %H:%M:%S')
-                        logger.debug(f"Publication timestamp: {timestamp}")
-                    except ValueError:
-                        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        logger.debug(f"Invalid datetime format, using: {timestamp}")
-                else:
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    logger.debug(f"No publication timestamp, using: {timestamp}")
-
-                news_data.append({
-                    'headline': headline,
-                    'source': source,
-                    'url': url,
-                    'category': matching_keyword,
-                    'timestamp': timestamp  # Renamed from 'date'
-                })
-                logger.info(f"Scraped article: {headline} ({matching_keyword})")
-            except Exception as e:
-                logger.error(f"Error processing article {index+1}: {e}")
-                continue
-
+                WebDriverWait(driver, 4).until(
+                    lambda d: len(d.find_elements(By.CSS_SELECTOR, ARTICLE_CSS)) > loaded
+                )
+            except TimeoutException:
+                logger.debug("No new articles loaded after scrolling, stopping.")
+                break
+            loaded = len(driver.find_elements(By.CSS_SELECTOR, ARTICLE_CSS))
+        return driver.page_source
     except Exception as e:
         logger.error(f"Error fetching landing page: {e}")
+        return None
     finally:
         driver.quit()
 
+@lru_cache(maxsize=None)
+def html_parser(encoding):
+    """Return a shared lxml HTML parser for the given encoding (None to detect it from the page)."""
+    return lxml.html.HTMLParser(encoding=encoding)
+
+def find_article_containers(html, encoding=None):
+    """Parse page HTML (str or bytes) and return the article container elements."""
+    try:
+        return ARTICLE_SELECTOR(lxml.html.fromstring(html, parser=html_parser(encoding)))
+    except Exception as e:
+        logger.error(f"Error parsing landing page: {e}")
+        return []
+
+def scrape_ground_news(keywords, max_articles=50, source_type='coverage'):
+    """
+    Scrape headlines from Ground.news landing page, filtering by keywords.
+    
+    Args:
+        keywords: List of keywords to filter headlines.
+        max_articles: Maximum number of article containers to process.
+        source_type: 'coverage' for bias coverage, 'category' for category.
+    
+    Returns:
+        List of dictionaries with headline, source, URL, category, and timestamp.
+    """
+    base_url = BASE_URL
+    news_data = []
+    seen = set()  # Headlines and URLs already scraped
+
+    if not keywords:
+        logger.warning("No keywords to match headlines against.")
+        return news_data
+
+    # One case-insensitive alternation so each headline is scanned once
+    keyword_pattern, keyword_rank = compile_keywords(tuple(keywords))
+    # The source query depends only on source_type, so pick it once for the whole page
+    source_xpath = COVERAGE_SOURCE_XPATH if source_type == 'coverage' else CATEGORY_SOURCE_XPATH
+
+    # The server-rendered markup usually carries the article cards; only start Chrome when it doesn't
+    articles = []
+    html, encoding = fetch_landing_page(base_url)
+    if html:
+        articles = find_article_containers(html, encoding)
+    if not articles:
+        logger.info("No article containers in server-rendered HTML, falling back to headless Chrome...")
+        html = render_landing_page(base_url, max_articles)
+        if html:
+            articles = find_article_containers(html)
+    logger.info(f"Found {len(articles)} article containers")
+
+    if not articles:
+        logger.warning("No articles found on landing page. Check selectors or site structure.")
+
+    for index, article in enumerate(articles[:max_articles]):
+        try:
+            # Extract headline
+            headline = HEADLINE_XPATH(article).strip()
+            if not headline:
+                logger.debug("Skipping article %d with no valid headline", index + 1)
+                continue
+
+            # Extract URL
+            url = article.get('href') or None
+            if url and url.startswith('/'):
+                url = base_url + url
+            elif url and not url.startswith('http'):
+                url = None
+            if not url:
+                logger.debug("Skipping article with no valid URL: %.50s...", headline)
+                continue
+
+            # Skip duplicate headlines or URLs with a single membership pass
+            if headline in seen or url in seen:
+                logger.debug("Skipping duplicate article: %.50s...", headline)
+                continue
+            seen.add(headline)
+            seen.add(url)
+
+            # Check for keywords; conflict keywords win, otherwise the earliest keyword in the list
+            found = {match.lower() for match in keyword_pattern.findall(headline)}
+            if not found:
+                logger.debug("Skipping article with no matching keyword: %.50s...", headline)
+                continue
+            if found & CONFLICT_KEYWORDS:
+                matching_keyword = CONFLICT_CATEGORY
+            else:
+                matching_keyword = min(keyword_rank[kw] for kw in found)[1]
+
+            # Extract source
+            source = source_xpath(article).strip() or 'Unknown'
+
+            # Extract publication timestamp
+            date_str = TIMESTAMP_XPATH(article)
+            if date_str:
+                try:
+                    timestamp = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%SZ').strftime('%Y-%m-%d %H:%M:%S')
+                except ValueError:
+                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    logger.debug("Invalid datetime format, using: %s", timestamp)
+            else:
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+            news_data.append({
+                'headline': headline,
+                'source': source,
+                'url': url,
+                'category': matching_keyword,
+                'timestamp': timestamp  # Renamed from 'date'
+            })
+            logger.info("Scraped article: %s (%s)", headline, matching_keyword)
+        except Exception as e:
+            logger.error(f"Error processing article {index+1}: {e}")
+            continue
+
     logger.info(f"Scraped {len(news_data)} articles.")
     return news_data
 
@@ -1,22 +1,17 @@
 import os
 import logging
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from dotenv import load_dotenv
+from config import GOOGLE_CREDENTIALS_PATH, SPREADSHEET_NAME, LOG_LEVEL
+from google_clients import get_gspread_client
 
 # Set up logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-GOOGLE_CREDENTIALS_PATH = os.getenv('GOOGLE_CREDENTIALS_PATH')
-SPREADSHEET_NAME = os.getenv('SPREADSHEET_NAME', 'GroundNewsArticles')
-
 def initialize_gsheets_client(credentials_path):
     """
     Initialize Google Sheets client using service account credentials.
@@ -27,14 +22,8 @@ def initialize_gsheets_client(credentials_path):
     Returns:
         gspread.Client: Authorized client or None if failed.
     """
-    scope = [
-        'https://spreadsheets.google.com/feeds',
-        'https://www.googleapis.com/auth/drive'
-    ]
     try:
-        logger.info("Initializing Google Sheets client...")
-        creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_path, scope)
-        client = gspread.authorize(creds)
+        client = get_gspread_client(credentials_path)
         logger.info("Google Sheets client initialized successfully.")
         return client
     except Exception as e:
@@ -70,21 +59,23 @@ def store_articles(articles, credentials_path, spreadsheet_name):
         # Select or create worksheet
         try:
             worksheet = spreadsheet.worksheet('Articles')
+            # Get existing URLs to avoid duplicates: one ranged read of column C below the header
+            url_ranges = worksheet.batch_get(['C2:C'])
+            existing_urls = {row[0] for value_range in url_ranges for row in value_range if row}
         except gspread.WorksheetNotFound:
             logger.info("Creating new worksheet: Articles")
             worksheet = spreadsheet.add_worksheet(title='Articles', rows=1000, cols=6)
             # Set headers
             headers = ['Headline', 'Source', 'URL', 'Category', 'Summary', 'Timestamp']
             worksheet.append_row(headers, table_range='A1:F1')
-
-        # Get existing URLs to avoid duplicates
-        existing_urls = set(worksheet.col_values(3)[1:])  # Column C (URL), skip header
+            # A new worksheet has no URLs yet, so skip the read
+            existing_urls = set()
 
         # Prepare rows to append
         rows_to_append = []
         for article in articles:
             if article.get('url') in existing_urls:
-                logger.debug(f"Skipping duplicate article: {article.get('headline', 'Unknown')[:50]}...")
+                logger.debug("Skipping duplicate article: %.50s...", article.get('headline', 'Unknown'))
                 continue
             row = [
                 article.get('headline', ''),
@@ -94,16 +85,20 @@ def store_articles(articles, credentials_path, spreadsheet_name):
                 article.get('summary', 'No summary available.'),
                 article.get('timestamp', '')
             ]
-            rows_to_append.append(row)
+            rows_to_append.append([str(value) for value in row])
             existing_urls.add(article.get('url'))
 
         if not rows_to_append:
             logger.info("No new articles to append.")
             return True
 
-        # Append rows
+        # Append all rows in a single values.append request
         logger.info(f"Appending {len(rows_to_append)} articles to Google Sheet...")
-        worksheet.append_rows(rows_to_append, value_input_option='RAW')
+        spreadsheet.values_append(
+            f"{worksheet.title}!A:F",
+            params={'valueInputOption': 'RAW', 'insertDataOption': 'INSERT_ROWS'},
+            body={'values': rows_to_append}
+        )
         logger.info("Articles successfully stored in Google Sheet.")
         return True
 
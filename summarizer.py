@@ -1,65 +1,429 @@
-import os
+import asyncio
+import orjson
 import logging
-from openai import OpenAI
-from dotenv import load_dotenv
+import httpx
+from aiolimiter import AsyncLimiter
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, APIConnectionError, InternalServerError, RateLimitError
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
+from config import (
+    LOG_LEVEL,
+    OPENAI_API_KEY,
+    OPENAI_MAX_CONCURRENT_REQUESTS,
+    OPENAI_MAX_RPM,
+    OPENAI_BATCH_MIN_ARTICLES,
+    OPENAI_BATCH_TIMEOUT
+)
+from summary_cache import cache_key, lookup_summary, store_summary
 
 # Set up logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 if not OPENAI_API_KEY:
     logger.error("OpenAI API key not found. Please set OPENAI_API_KEY in .env file.")
     raise ValueError("Missing OpenAI API key")
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Number of articles packed into a single summarization request
+ARTICLES_PER_REQUEST = 20
+# Seconds between Batch API status checks
+BATCH_POLL_INTERVAL = 30
+
+# Prompt text is built once and kept byte-identical across requests. Everything stable sits
+# in a leading system message long enough (over 1024 tokens, hence the field notes and
+# worked examples) for OpenAI's automatic prompt caching to reuse it; the user message
+# carries only article data.
+SUMMARY_INSTRUCTIONS = """You are a helpful assistant that summarizes news articles concisely.
+
+Each article is given as its headline, the category it was filed under, a line describing its source coverage, and its URL. You don't have the article text, so work only from those fields.
+
+Guidelines:
+- Summarize each article in 2-3 concise sentences, keeping the summary under 100 words. Short is better than padded; every sentence must be supported by the headline.
+- Focus on the key events and the locations the headline names, since summaries feed a script that counts the places in the news.
+- Only name places that appear in the headline. Never add a city, capital, region or country the headline doesn't mention, and don't replace a country with its capital or a government with the city it sits in.
+- Open with what happened, naming the main people, groups or countries from the headline.
+- Use the second sentence to restate the rest of the headline's information, such as its context, its cause or what is still to come.
+- Don't invent figures, quotes, dates, places or outcomes that the headline doesn't state. Where a decision or result is still pending, say so.
+- Attribute claims to the source named in the headline (for example "the White House says") rather than stating them as fact.
+- Write in a neutral tone without opinion, speculation or loaded wording, whatever the coverage line says about the sources' bias.
+- Don't repeat the headline word for word, mention the URL, or comment on the coverage statistics.
+- Use plain sentences with no bullet points, headings or quotation marks around the summary.
+
+Reading the fields:
+- The category is a keyword bucket chosen by the scraper, not an editorial label. Use it only to understand the topic; don't claim a link to the category that the headline doesn't make.
+- The source line describes how widely the story is covered and the political lean of the outlets covering it. It is never content for the summary.
+- Keep names, places and abbreviations spelled and capitalised exactly as in the headline.
+- Keep the headline's tense and certainty. Report words such as "says", "warns", "plans" or "could" as claims, warnings, plans or possibilities, not as things that have happened.
+- If the headline is a question, an opinion piece or a live-updates page, say what it asks, argues or covers without answering it.
+- Keep numbers as the headline gives them. "Dozens", "thousands" or an exact figure stay as written, without rounding, converting or estimating them.
+- Refer to people the way the headline does, adding a role only when the headline states it.
+- Don't speculate about motives, consequences, reactions or next steps that the headline doesn't mention.
+- If the headline is too vague to support two sentences, write one accurate sentence instead of guessing.
+
+Examples:
+
+Headline: UK parliament votes for assisted dying paving way for historic law change
+Category: UK
+Source: 43% Center coverage: 222 sources
+Summary: The UK parliament has voted in favour of assisted dying. The vote paves the way for a historic change to the law.
+
+Headline: Trump to decide on US action in Israel-Iran conflict within two weeks, White House says
+Category: Israel-Hamas Conflict
+Source: 37% Right coverage: 73 sources
+Summary: The White House says President Trump will decide within two weeks whether the US will take action in the conflict between Israel and Iran. No decision has been announced yet.
+
+Headline: Wildfires force thousands to evacuate as heatwave grips southern Europe
+Category: climate
+Source: 51% Left coverage: 140 sources
+Summary: Wildfires have forced thousands of people to evacuate their homes. The fires come as a heatwave grips southern Europe.
+
+Headline: Iran says talks with European ministers in Geneva will continue despite strikes
+Category: Iran
+Source: 40% Center coverage: 95 sources
+Summary: Iran says its talks with European ministers in Geneva will continue. It says the talks will go on despite the strikes.
+
+Headline: US Senate passes spending bill hours before government shutdown deadline
+Category: US
+Source: 35% Center coverage: 180 sources
+Summary: The US Senate has passed a spending bill. The vote came hours before the deadline for a government shutdown.
+
+Headline: Israeli strikes on Gaza kill dozens as ceasefire talks stall in Cairo
+Category: Israel-Hamas Conflict
+Source: 45% Left coverage: 210 sources
+Summary: Israeli strikes on Gaza have killed dozens of people. The strikes come as ceasefire talks in Cairo have stalled.
+
+Headline: Bank of England holds interest rates as inflation stays above target
+Category: UK
+Source: 48% Center coverage: 88 sources
+Summary: The Bank of England has kept interest rates unchanged. Inflation remains above the bank's target.
+
+Headline: UN nuclear watchdog says it has lost track of Iran's enriched uranium stockpile
+Category: Iran
+Source: 39% Right coverage: 102 sources
+Summary: The UN nuclear watchdog says it has lost track of Iran's stockpile of enriched uranium. It says it can no longer account for the material.
+
+Headline: US Supreme Court agrees to hear challenge to federal tariff powers
+Category: US
+Source: 42% Center coverage: 120 sources
+Summary: The US Supreme Court has agreed to hear a challenge to the federal government's tariff powers. The court has not yet ruled on the case."""
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": SUMMARY_INSTRUCTIONS + "\n\nReply with the summary text only."
+}
+BATCH_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        SUMMARY_INSTRUCTIONS + "\n\n"
+        "You will receive a JSON list of articles, each with a numeric id. "
+        'Return a JSON object of the form {"summaries": [{"id": <article id>, "summary": "..."}]} '
+        "with one entry per article."
+    )
+}
+ARTICLE_PROMPT = (
+    "Headline: {headline}\n"
+    "Category: {category}\n"
+    "Source: {source}\n"
+    "URL: {url}"
+)
+
+class RequestThrottle:
+    """Async context manager bounding OpenAI requests by concurrency and requests per minute."""
+
+    def __init__(self, max_concurrent, max_per_minute):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.limiter = AsyncLimiter(max_per_minute, time_period=60)
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        try:
+            await self.limiter.acquire()
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+def build_http_client():
+    """
+    Build the HTTP client behind AsyncOpenAI, with its pool sized to the request concurrency.
+    
+    Returns:
+        openai.DefaultAsyncHttpxClient: HTTP/2 client that multiplexes concurrent requests
+        over a few kept-alive connections.
+    """
+    return DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONCURRENT_REQUESTS,
+            max_keepalive_connections=OPENAI_MAX_CONCURRENT_REQUESTS,
+            keepalive_expiry=30.0
+        ),
+        # Batched requests generate up to 150 tokens per article, so allow a long read
+        timeout=httpx.Timeout(120.0, connect=5.0)
+    )
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception_type((RateLimitError, InternalServerError, APIConnectionError)),
+    before_sleep=lambda retry_state: logger.info(f"Retrying OpenAI call (attempt {retry_state.attempt_number})..."),
+    reraise=True
+)
+async def create_completion(client, throttle, **kwargs):
+    """Create a chat completion within the throttle, retrying on rate limits and server errors."""
+    # Each attempt takes its own slot, so backoff sleeps don't hold one
+    async with throttle:
+        return await client.chat.completions.create(**kwargs)
 
-def summarize_article(article):
+async def summarize_article(client, throttle, article):
     """
     Summarize article using OpenAI API based on headline and metadata.
     
     Args:
+        client: AsyncOpenAI client.
+        throttle: RequestThrottle shared by all requests in the run.
         article: Dictionary with headline, source, url, category, date.
     
     Returns:
         str: Summary (2-3 sentences) or default if failed.
     """
     try:
-        logger.debug(f"Summarizing article: {article['headline'][:50]}...")
-        prompt = (
-            "Summarize the following news article in 2-3 concise sentences based on its headline, category, and source. "
-            "Focus on key events and potential locations, keeping the summary under 100 words.\n\n"
-            f"Headline: {article['headline']}\n"
-            f"Category: {article['category']}\n"
-            f"Source: {article['source']}\n"
-            f"URL: {article['url']}"
-        )
-        response = client.chat.completions.create(
+        logger.debug("Summarizing article: %.50s...", article['headline'])
+        response = await create_completion(
+            client,
+            throttle,
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes news articles concisely."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=[SYSTEM_MESSAGE, {"role": "user", "content": ARTICLE_PROMPT.format(**article)}],
             max_tokens=150,
             temperature=0.5
         )
         summary = response.choices[0].message.content.strip()
-        logger.debug(f"Generated summary: {summary[:50]}...")
+        logger.debug("Generated summary: %.50s...", summary)
         return summary if summary else 'No summary available.'
     except Exception as e:
         logger.error(f"Error summarizing article: {e}")
         return 'No summary available.'
 
-def summarize_articles(articles):
+def build_batch_request(articles):
     """
-    Add summaries to a list of articles.
+    Build the chat completion parameters for summarizing several articles at once.
+    
+    Args:
+        articles: List of dictionaries with headline, source, url, category, date.
+    
+    Returns:
+        dict: Keyword arguments for chat.completions.create, also used as a Batch API body.
+    """
+    payload = [
+        {
+            'id': index,
+            'headline': article['headline'],
+            'category': article['category'],
+            'source': article['source'],
+            'url': article['url']
+        }
+        for index, article in enumerate(articles)
+    ]
+    return {
+        'model': "gpt-4o-mini",
+        'messages': [BATCH_SYSTEM_MESSAGE, {"role": "user", "content": orjson.dumps(payload).decode()}],
+        'max_tokens': 150 * len(articles),
+        'temperature': 0.5,
+        'response_format': {"type": "json_object"}
+    }
+
+def parse_batch_summaries(content, count):
+    """
+    Parse a batched summarization response, mapping summaries back by article id.
+    
+    Args:
+        content: JSON message content returned by the model.
+        count: Number of articles in the request.
+    
+    Returns:
+        List of summaries in request order, with None for articles the model skipped.
+    
+    Raises:
+        ValueError: If the response has no summaries list.
+    """
+    entries = orjson.loads(content).get('summaries')
+    if not isinstance(entries, list):
+        raise ValueError("Response has no 'summaries' list")
+    summaries = [None] * count
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        index, summary = entry.get('id'), entry.get('summary')
+        summary = summary.strip() if isinstance(summary, str) else None
+        if isinstance(index, int) and 0 <= index < count and summary:
+            summaries[index] = summary
+    return summaries
+
+async def summarize_article_batch(client, throttle, articles):
+    """
+    Summarize several articles with a single OpenAI request.
+    
+    Args:
+        client: AsyncOpenAI client.
+        throttle: RequestThrottle shared by all requests in the run.
+        articles: List of dictionaries with headline, source, url, category, date.
+    
+    Returns:
+        List of summaries in the same order as articles. Articles missing from
+        the batched response, or the whole batch if it cannot be parsed, fall
+        back to one request per article.
+    
+    Raises:
+        openai.OpenAIError: If the batched request itself fails after its retries.
+            Splitting it into single requests would only multiply the load on an
+            API that is already rate limiting or failing.
+    """
+    logger.debug(f"Summarizing batch of {len(articles)} articles...")
+    response = await create_completion(client, throttle, **build_batch_request(articles))
+    try:
+        summaries = parse_batch_summaries(response.choices[0].message.content, len(articles))
+    except Exception as e:
+        logger.error(f"Unparseable response for batch of {len(articles)} articles, falling back to single requests: {e}")
+        summaries = [None] * len(articles)
+
+    missing = [index for index, summary in enumerate(summaries) if summary is None]
+    if missing:
+        logger.debug(f"Re-requesting {len(missing)} articles missing from the batched response...")
+        retried = await asyncio.gather(*(summarize_article(client, throttle, articles[i]) for i in missing))
+        for index, summary in zip(missing, retried):
+            summaries[index] = summary
+    return summaries
+
+async def submit_batch(client, batches):
+    """
+    Submit article batches as one OpenAI Batch API job.
+    
+    Args:
+        client: AsyncOpenAI client.
+        batches: List of article lists; each becomes one request line keyed by its index.
+    
+    Returns:
+        openai.types.Batch: The created batch job.
+    """
+    # orjson writes UTF-8 bytes directly, so the JSONL file needs no separate encode step
+    lines = [
+        orjson.dumps({
+            'custom_id': str(index),
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': build_batch_request(batch)
+        })
+        for index, batch in enumerate(batches)
+    ]
+    input_file = await client.files.create(
+        file=('summaries.jsonl', b'\n'.join(lines)),
+        purpose='batch'
+    )
+    batch_job = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h'
+    )
+    logger.info(f"Submitted Batch API job {batch_job.id} with {len(batches)} requests.")
+    return batch_job
+
+async def summarize_with_batch_api(client, batches):
+    """
+    Summarize article batches through the OpenAI Batch API.
+    
+    Args:
+        client: AsyncOpenAI client.
+        batches: List of article lists.
+    
+    Returns:
+        List aligned with batches holding each batch's summaries, or None where a
+        batch has no usable result. Returns None if the job fails or times out.
+    """
+    try:
+        batch_job = await submit_batch(client, batches)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + OPENAI_BATCH_TIMEOUT
+        while batch_job.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            if loop.time() > deadline:
+                logger.warning(f"Batch API job {batch_job.id} not done after {OPENAI_BATCH_TIMEOUT}s, cancelling.")
+                await client.batches.cancel(batch_job.id)
+                return None
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+            batch_job = await client.batches.retrieve(batch_job.id)
+            logger.debug("Batch API job %s status: %s", batch_job.id, batch_job.status)
+        if batch_job.status != 'completed' or not batch_job.output_file_id:
+            logger.error(f"Batch API job {batch_job.id} ended with status {batch_job.status}.")
+            return None
+
+        output = await client.files.content(batch_job.output_file_id)
+        results = [None] * len(batches)
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            index = int(record['custom_id'])
+            try:
+                body = record['response']['body']
+                summaries = parse_batch_summaries(body['choices'][0]['message']['content'], len(batches[index]))
+                # Incomplete results are redone live as a whole batch
+                results[index] = summaries if None not in summaries else None
+            except Exception as e:
+                logger.error(f"Unusable Batch API result for request {index}: {e}")
+        return results
+    except Exception as e:
+        logger.error(f"Error running Batch API job: {e}")
+        return None
+
+async def summarize_uncached(articles):
+    """
+    Summarize articles with OpenAI, packing them into batched requests that
+    run concurrently. Large runs go through the Batch API.
+    
+    Args:
+        articles: List of article dictionaries.
+    
+    Returns:
+        List of summary strings in the same order as articles.
+    """
+    throttle = RequestThrottle(OPENAI_MAX_CONCURRENT_REQUESTS, OPENAI_MAX_RPM)
+    batches = [articles[i:i + ARTICLES_PER_REQUEST] for i in range(0, len(articles), ARTICLES_PER_REQUEST)]
+    # The client is created per run so its connection pool belongs to the running event loop.
+    # Its built-in retries are off so create_completion's retry policy is the only one.
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0, http_client=build_http_client()) as client:
+        results = [None] * len(batches)
+        if len(articles) >= OPENAI_BATCH_MIN_ARTICLES:
+            logger.info(f"Summarizing {len(articles)} articles with the Batch API...")
+            results = await summarize_with_batch_api(client, batches) or results
+
+        # Live requests for small runs and for anything the Batch API didn't return
+        pending = [index for index, result in enumerate(results) if result is None]
+        if pending:
+            logger.info(f"Summarizing {sum(len(batches[i]) for i in pending)} articles in {len(pending)} requests...")
+            live_results = await asyncio.gather(
+                *(summarize_article_batch(client, throttle, batches[i]) for i in pending),
+                return_exceptions=True
+            )
+            for index, result in zip(pending, live_results):
+                results[index] = result
+
+    # A failed batch must not take the others down with it
+    summaries = []
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error summarizing batch of {len(batch)} articles: {result}")
+            result = ['No summary available.'] * len(batch)
+        summaries.extend(result)
+    return summaries
+
+async def summarize_articles_async(articles):
+    """
+    Add summaries to a list of articles, reusing cached summaries of the same
+    or similar articles and sending only the rest to OpenAI.
     
     Args:
         articles: List of dictionaries with headline, source, url, category, date.
@@ -67,23 +431,53 @@ def summarize_articles(articles):
     Returns:
         List of dictionaries with added summary field.
     """
-    summarized_articles = []
-    for index, article in enumerate(articles, 1):
-        try:
-            logger.info(f"Processing article {index}: {article['headline'][:50]}...")
-            summary = summarize_article(article)
-            summarized_articles.append({
-                **article,
-                'summary': summary
-            })
-            logger.info(f"Summarized article {index}: {summary[:50]}...")
-        except Exception as e:
-            logger.error(f"Error processing article {index}: {e}")
-            summarized_articles.append({**article, 'summary': 'No summary available.'})
+    summaries = list(await asyncio.gather(*(lookup_summary(article) for article in articles)))
+    misses = [index for index, summary in enumerate(summaries) if summary is None]
+    if len(misses) < len(articles):
+        logger.info(f"Cache hit for {len(articles) - len(misses)} of {len(articles)} articles.")
+
+    if misses:
+        # Duplicates within the run (the same article scraped twice, or the same URL
+        # under another category) share one request instead of each being sent
+        unique = {}
+        for index in misses:
+            unique.setdefault(articles[index].get('url') or cache_key(articles[index]), []).append(index)
+        groups = list(unique.values())
+        fresh = await summarize_uncached([articles[group[0]] for group in groups])
+        for group, summary in zip(groups, fresh):
+            for index in group:
+                summaries[index] = summary
+        # Failed summaries aren't cached so the next run retries them
+        await asyncio.gather(*(
+            store_summary(articles[index], summary)
+            for group, summary in zip(groups, fresh)
+            if summary != 'No summary available.'
+            for index in group
+        ))
+
+    # Copies keep the caller's scraped articles untouched
+    summarized_articles = [dict(article, summary=summary) for article, summary in zip(articles, summaries)]
+    if logger.isEnabledFor(logging.INFO):
+        for index, summary in enumerate(summaries, 1):
+            logger.info("Summarized article %d: %.50s...", index, summary)
     
     logger.info(f"Summarized {len(summarized_articles)} articles.")
     return summarized_articles
 
+def summarize_articles(articles):
+    """
+    Add summaries to a list of articles.
+    
+    Synchronous wrapper around summarize_articles_async for existing callers.
+    
+    Args:
+        articles: List of dictionaries with headline, source, url, category, date.
+    
+    Returns:
+        List of dictionaries with added summary field.
+    """
+    return asyncio.run(summarize_articles_async(articles))
+
 def main():
     """Main function to test the summarizer with sample data."""
     sample_articles = [
@@ -0,0 +1,154 @@
+import re
+import asyncio
+import logging
+from collections import OrderedDict
+from config import LOG_LEVEL, REDIS_URL, SEMANTIC_CACHE_DISTANCE, SEMANTIC_CACHE_TTL
+
+# redisvl (and the embedding model behind it) is optional; without it only the in-process cache is used
+try:
+    from redisvl.extensions.cache.llm import SemanticCache
+    from redisvl.utils.vectorize import HFTextVectorizer
+except ImportError:
+    SemanticCache = None
+
+# Set up logging
+logging.basicConfig(
+    level=LOG_LEVEL,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_NAME = 'news_summaries'
+EMBEDDING_MODEL = 'redis/langcache-embed-v1'
+# Exact-match summaries kept in memory ahead of the semantic cache
+LOCAL_CACHE_SIZE = 4096
+# Figures in a headline; a semantic hit must carry the same ones
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)*')
+
+_local_cache = OrderedDict()
+
+_semantic_cache = None
+_semantic_cache_disabled = False
+
+def cache_key(article):
+    """
+    Build the exact-match key for an article in the in-process cache.
+    
+    Args:
+        article: Dictionary with headline, category, source and url.
+    
+    Returns:
+        Tuple of the normalized headline, category, source and url.
+    """
+    return tuple(
+        ' '.join(str(article.get(field, '')).split()).lower()
+        for field in ('headline', 'category', 'source', 'url')
+    )
+
+def cache_prompt(article):
+    """
+    Build the text an article's summary is cached under.
+    
+    The category is part of the key so the same headline in a different
+    context doesn't collide.
+    
+    Args:
+        article: Dictionary with headline and category.
+    
+    Returns:
+        Cache prompt string.
+    """
+    return f"{article.get('category', '')}: {article.get('headline', '')}"
+
+def get_semantic_cache():
+    """
+    Return the shared semantic cache, connecting on first use.
+    
+    Returns:
+        SemanticCache object, or None when REDIS_URL is unset, redisvl is
+        missing or Redis can't be reached.
+    """
+    global _semantic_cache, _semantic_cache_disabled
+    if _semantic_cache is not None or _semantic_cache_disabled or not REDIS_URL:
+        return _semantic_cache
+    if SemanticCache is None:
+        logger.warning("REDIS_URL is set but redisvl is not installed; semantic cache disabled.")
+        _semantic_cache_disabled = True
+        return None
+    try:
+        _semantic_cache = SemanticCache(
+            name=SEMANTIC_CACHE_NAME,
+            redis_url=REDIS_URL,
+            distance_threshold=SEMANTIC_CACHE_DISTANCE,
+            ttl=SEMANTIC_CACHE_TTL,
+            vectorizer=HFTextVectorizer(EMBEDDING_MODEL)
+        )
+        logger.info(f"Connected semantic cache '{SEMANTIC_CACHE_NAME}'.")
+    except Exception as e:
+        logger.warning(f"Semantic cache unavailable, continuing without it: {e}")
+        _semantic_cache_disabled = True
+    return _semantic_cache
+
+async def lookup_summary(article):
+    """
+    Look up a cached summary for a similar article.
+    
+    Args:
+        article: Dictionary with headline and category.
+    
+    Returns:
+        Cached summary string, or None on a miss.
+    """
+    key = cache_key(article)
+    if key in _local_cache:
+        _local_cache.move_to_end(key)
+        return _local_cache[key]
+    cache = get_semantic_cache()
+    if cache is None:
+        return None
+    prompt = cache_prompt(article)
+    try:
+        # Embedding and the Redis round trip are blocking, so keep them off the event loop
+        hits = await asyncio.to_thread(cache.check, prompt=prompt, num_results=1)
+        if not hits:
+            return None
+        # "Strikes kill 12" and "strikes kill 40" embed closely but need different summaries
+        if NUMBER_PATTERN.findall(hits[0].get('prompt', '')) != NUMBER_PATTERN.findall(prompt):
+            logger.debug("Ignoring semantic cache hit with different figures: %.50s...", hits[0].get('prompt', ''))
+            return None
+        remember_summary(key, hits[0]['response'])
+        return hits[0]['response']
+    except Exception as e:
+        logger.warning(f"Semantic cache lookup failed: {e}")
+        return None
+
+def remember_summary(key, summary):
+    """
+    Add a summary to the in-process cache, evicting the least recently used.
+    
+    Args:
+        key: Tuple from cache_key.
+        summary: Summary string to cache.
+    """
+    _local_cache[key] = summary
+    _local_cache.move_to_end(key)
+    if len(_local_cache) > LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+async def store_summary(article, summary):
+    """
+    Store an article's summary in the in-process and semantic caches.
+    
+    Args:
+        article: Dictionary with headline, category, source and url.
+        summary: Summary string to cache.
+    """
+    remember_summary(cache_key(article), summary)
+    cache = get_semantic_cache()
+    if cache is None:
+        return
+    try:
+        await asyncio.to_thread(cache.store, prompt=cache_prompt(article), response=summary)
+    except Exception as e:
+        logger.warning(f"Semantic cache store failed: {e}")
\ No newline at end of file